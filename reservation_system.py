@@ -17,71 +17,265 @@ Requisitos clave:
 
 from __future__ import annotations
 
+import contextlib
 import json
+import logging
+import mmap
 import os
-from dataclasses import dataclass
-from typing import Any
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Iterable
 
+try:
+    import orjson
+except ImportError:  # Dependencia opcional: se usa json de la stdlib
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Dependencia opcional: sin ella se carga completo
+    ijson = None
+
+
+_log = logging.getLogger(__name__)
 
 DATA_DIR = "data"
 HOTELS_FILE = "hotels.json"
 CUSTOMERS_FILE = "customers.json"
 RESERVATIONS_FILE = "reservations.json"
 
+# A partir de este tamaño los archivos se mapean en memoria (mmap) en vez
+# de copiarse completos a un bytes antes de parsear.
+_UMBRAL_MMAP_BYTES = 1024 * 1024
+
+# Enteros que orjson ya no puede representar sin perder precisión (puede
+# dar falsos positivos, p. ej. dígitos dentro de un string; no importa)
+_ENTERO_LARGO = re.compile(rb"-\d{19}|\d{20}")
+
+# A partir de este tamaño, la primera consulta por id a un archivo aún no
+# cargado se resuelve en streaming (ijson) sin materializar toda la lista.
+_UMBRAL_STREAMING_BYTES = 1024 * 1024
+
+# Estatus de reservación internados: se comparan por identidad (is)
+_ACTIVA = sys.intern("activa")
+_CANCELADA = sys.intern("cancelada")
+
+# Llaves requeridas de cada registro, en el orden de sus campos
+_HOTEL_KEYS = (
+    "id",
+    "nombre",
+    "ubicacion",
+    "habitaciones_total",
+    "habitaciones_disponibles",
+)
+_CUSTOMER_KEYS = ("id", "nombre", "email")
+_RESERVATION_KEYS = (
+    "id",
+    "hotel_id",
+    "customer_id",
+    "habitaciones",
+    "fecha_inicio",
+    "fecha_fin",
+    "estatus",
+)
+
 
 def _asegurar_directorio_data(data_dir: str) -> None:
     """Crea el directorio de datos si no existe."""
     os.makedirs(data_dir, exist_ok=True)
 
 
+def _asegurar_archivo(path: str) -> None:
+    """Crea el archivo con [] si no existe, sin leer su contenido."""
+    if os.path.exists(path):
+        return
+    try:
+        with open(path, "wb") as f_out:
+            f_out.write(b"[]")
+    except OSError as exc:
+        _log.error("No se pudo crear archivo %s: %s", path, exc)
+
+
+def _precargar_archivo(path: str) -> None:
+    """Sugiere al kernel traer el archivo al page cache antes de leerlo."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    with contextlib.suppress(OSError):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+
 def _ruta(data_dir: str, filename: str) -> str:
     """Devuelve la ruta completa de un archivo dentro del data_dir."""
     return os.path.join(data_dir, filename)
 
 
-def _leer_json_lista(path: str) -> list[dict[str, Any]]:
+def _json_a_bytes(data: Any, legible: bool = False) -> bytes:
+    """Serializa a JSON UTF-8 (compacto, o indentado si legible)."""
+    if orjson is not None:
+        opcion = orjson.OPT_INDENT_2 if legible else 0
+        try:
+            return orjson.dumps(data, option=opcion)
+        except orjson.JSONEncodeError:
+            pass  # p. ej. enteros fuera de 64 bits: se usa la stdlib
+    if legible:
+        texto = json.dumps(data, ensure_ascii=False, indent=2)
+    else:
+        texto = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return texto.encode("utf-8")
+
+
+def _json_desde_bytes(contenido: Any) -> Any:
+    """
+    Parsea JSON desde bytes UTF-8 (o un buffer, si hay orjson).
+
+    orjson convierte en float los enteros fuera de [-2**63, 2**64), así que
+    si el contenido podría tenerlos se parsea con la stdlib.
+    """
+    if orjson is not None and _ENTERO_LARGO.search(contenido) is None:
+        return orjson.loads(contenido)
+    return json.loads(bytes(contenido))
+
+
+def _parsear_archivo(f_in: BinaryIO, buffer: bytearray | None = None) -> Any:
+    """
+    Parsea el JSON de un archivo abierto en binario.
+
+    Con orjson se evita la copia intermedia a bytes: los archivos grandes
+    se parsean directo sobre un mmap y los demás se leen con readinto()
+    sobre un buffer reutilizable (que solo crece). json de la stdlib no
+    acepta buffers y lee normal.
+    """
+    tamano = os.fstat(f_in.fileno()).st_size
+    if orjson is None:
+        return _json_desde_bytes(f_in.read())
+    if tamano >= _UMBRAL_MMAP_BYTES:
+        with mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            with memoryview(mapa) as vista:
+                return _json_desde_bytes(vista)
+    if buffer is None:
+        return _json_desde_bytes(f_in.read())
+
+    # Un byte extra para notar si el archivo creció desde el fstat
+    if len(buffer) <= tamano:
+        buffer.extend(bytes(tamano + 1 - len(buffer)))
+    # Cada vista se libera con with: si una excepción (retenida p. ej. por
+    # un log) la mantuviera viva, el buffer ya no podría crecer
+    with memoryview(buffer) as vista:
+        with vista[:tamano + 1] as destino:
+            leidos = f_in.readinto(destino)
+        with vista[:leidos] as datos:
+            if leidos > tamano:
+                return _json_desde_bytes(datos.tobytes() + f_in.read())
+            return _json_desde_bytes(datos)
+
+
+def _leer_json_lista(
+    path: str,
+    buffer: bytearray | None = None,
+) -> list[dict[str, Any]]:
     """
     Lee un JSON y devuelve una lista de dicts.
 
+    Si se da un buffer, se reutiliza para leer el archivo (ver
+    _parsear_archivo).
+
     Si el archivo no existe, lo crea con [] y regresa [].
-    Si el JSON está corrupto o no es lista, imprime error y regresa [].
-    Si encuentra elementos no-dict, los omite e imprime error.
+    Si el JSON está corrupto o no es lista, registra error y regresa [].
+    Si encuentra elementos no-dict, los omite y registra error.
     """
     if not os.path.exists(path):
-        try:
-            with open(path, "w", encoding="utf-8") as f_out:
-                json.dump([], f_out)
-        except OSError as exc:
-            print(f"ERROR: No se pudo crear archivo {path}: {exc}")
+        _asegurar_archivo(path)
         return []
 
     try:
-        with open(path, "r", encoding="utf-8") as f_in:
-            data = json.load(f_in)
-    except (OSError, json.JSONDecodeError) as exc:
-        print(f"ERROR: JSON inválido en {path}: {exc}")
+        with open(path, "rb") as f_in:
+            data = _parsear_archivo(f_in, buffer)
+    except (OSError, ValueError) as exc:
+        _log.error("JSON inválido en %s: %s", path, exc)
         return []
 
     if not isinstance(data, list):
-        print(f"ERROR: Se esperaba lista en {path}, pero llegó {type(data)}")
+        _log.error(
+            "Se esperaba lista en %s, pero llegó %s", path, type(data)
+        )
         return []
 
     registros: list[dict[str, Any]] = []
     for i, item in enumerate(data, start=1):
         if not isinstance(item, dict):
-            print(f"ERROR: Elemento #{i} no es dict en {path}, se omite.")
+            _log.error("Elemento #%d no es dict en %s, se omite.", i, path)
             continue
         registros.append(item)
     return registros
 
 
-def _escribir_json_lista(path: str, data: list[dict[str, Any]]) -> None:
-    """Escribe una lista de dicts como JSON (pretty)."""
+def _buscar_en_streaming(path: str, reg_id: int) -> dict[str, Any] | None:
+    """Recorre el JSON con ijson y corta en el primer registro con ese id."""
+    with open(path, "rb") as f_in:
+        for item in ijson.items(f_in, "item"):
+            if not isinstance(item, dict):
+                continue
+            item_id = item.get("id")
+            if isinstance(item_id, int) and item_id == reg_id:
+                return item
+    return None
+
+
+def _escribir_json_lista(
+    path: str,
+    data: list[dict[str, Any]],
+    legible: bool = False,
+) -> bool:
+    """
+    Escribe una lista de dicts como JSON (compacto por defecto).
+
+    Escribe a un temporal y lo renombra encima del original, así una
+    falla a media escritura nunca deja el archivo truncado.
+    Regresa False (y registra error) si no se pudo escribir.
+    """
+    contenido = _json_a_bytes(data, legible)
+    tmp = path + ".tmp"
     try:
-        with open(path, "w", encoding="utf-8") as f_out:
-            json.dump(data, f_out, ensure_ascii=False, indent=2)
+        with open(tmp, "wb") as f_out:
+            f_out.write(contenido)
+            f_out.flush()
+            os.fsync(f_out.fileno())
+        os.replace(tmp, path)
     except OSError as exc:
-        print(f"ERROR: No se pudo escribir {path}: {exc}")
+        _log.error("No se pudo escribir %s: %s", path, exc)
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        return False
+    return True
+
+
+def _firma_archivo(path: str) -> tuple[int, int] | None:
+    """Devuelve (mtime_ns, tamaño) del archivo, o None si no existe."""
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+def _indexar_por_id(registros: list[dict[str, Any]]) -> dict[int, int]:
+    """
+    Construye un índice id -> posición en la lista.
+
+    Omite ids no enteros; si un id se repite, gana la primera aparición
+    (igual que la búsqueda lineal).
+    """
+    indice: dict[int, int] = {}
+    for pos, reg in enumerate(registros):
+        reg_id = reg.get("id")
+        if isinstance(reg_id, int) and reg_id not in indice:
+            indice[reg_id] = pos
+    return indice
 
 
 def _siguiente_id(registros: list[dict[str, Any]]) -> int:
@@ -94,15 +288,47 @@ def _siguiente_id(registros: list[dict[str, Any]]) -> int:
     return max_id + 1
 
 
+def _valores_requeridos(
+    data: dict[str, Any],
+    llaves: tuple[str, ...],
+    entidad: str,
+) -> list[Any] | None:
+    """
+    Extrae las llaves requeridas de un registro en una sola pasada.
+
+    Si no es dict o falta alguna llave (o es null), registra error y
+    regresa None.
+    """
+    if not isinstance(data, dict):
+        _log.error(
+            "Registro de %s inválido: se esperaba dict, llegó %s",
+            entidad,
+            type(data),
+        )
+        return None
+    valores = list(map(data.get, llaves))
+    if None in valores:
+        faltante = llaves[valores.index(None)]
+        _log.error("Registro de %s inválido: falta %s", entidad, faltante)
+        return None
+    return valores
+
+
 def _validar_str_no_vacio(valor: Any, campo: str) -> str:
     """Valida que un valor sea string no vacío."""
-    if not isinstance(valor, str) or not valor.strip():
-        raise ValueError(f"{campo} debe ser un string no vacío.")
-    return valor.strip()
+    if isinstance(valor, str):
+        limpio = valor.strip()
+        if limpio:
+            return limpio
+    raise ValueError(f"{campo} debe ser un string no vacío.")
 
 
 def _validar_int_no_neg(valor: Any, campo: str) -> int:
     """Valida que un valor sea entero no negativo."""
+    # Camino rápido: int exacto (excluye bool) sin más verificaciones
+    # pylint: disable-next=unidiomatic-typecheck
+    if type(valor) is int and valor >= 0:
+        return valor
     if isinstance(valor, bool):
         raise ValueError(f"{campo} inválido.")
     if not isinstance(valor, int) or valor < 0:
@@ -112,15 +338,19 @@ def _validar_int_no_neg(valor: Any, campo: str) -> int:
 
 def _validar_int_pos(valor: Any, campo: str) -> int:
     """Valida que un valor sea entero positivo (> 0)."""
+    # pylint: disable-next=unidiomatic-typecheck
+    if type(valor) is int and valor > 0:
+        return valor
     val = _validar_int_no_neg(valor, campo)
     if val <= 0:
         raise ValueError(f"{campo} debe ser int > 0.")
     return val
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Hotel:
     """Entidad Hotel."""
+
     hotel_id: int
     nombre: str
     ubicacion: str
@@ -141,33 +371,30 @@ class Hotel:
     def from_dict(data: dict[str, Any]) -> Hotel | None:
         """
         Construye un Hotel de forma segura.
-        Si el dict está incompleto o mal tipado, imprime error y regresa None.
+        Si el dict está incompleto o mal tipado, lo registra y regresa None.
         """
+        valores = _valores_requeridos(data, _HOTEL_KEYS, "hotel")
+        if valores is None:
+            return None
+        hotel_id, nombre, ubicacion, total, disp = valores
         try:
-            hotel_id = _validar_int_pos(data["id"], "hotel.id")
-            nombre = _validar_str_no_vacio(data["nombre"], "hotel.nombre")
-            ubicacion = _validar_str_no_vacio(
-                data["ubicacion"],
-                "hotel.ubicacion",
-            )
-            total = _validar_int_no_neg(
-                data["habitaciones_total"], "hotel.habitaciones_total"
-            )
-            disp = _validar_int_no_neg(
-                data["habitaciones_disponibles"],
-                "hotel.habitaciones_disponibles",
-            )
+            hotel_id = _validar_int_pos(hotel_id, "hotel.id")
+            nombre = _validar_str_no_vacio(nombre, "hotel.nombre")
+            ubicacion = _validar_str_no_vacio(ubicacion, "hotel.ubicacion")
+            total = _validar_int_no_neg(total, "hotel.habitaciones_total")
+            disp = _validar_int_no_neg(disp, "hotel.habitaciones_disponibles")
             if disp > total:
                 raise ValueError("hotel.habitaciones_disponibles > total")
             return Hotel(hotel_id, nombre, ubicacion, total, disp)
-        except (KeyError, TypeError, ValueError) as exc:
-            print(f"ERROR: Registro de hotel inválido: {exc}")
+        except (TypeError, ValueError) as exc:
+            _log.error("Registro de hotel inválido: %s", exc)
             return None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Customer:
     """Entidad Customer."""
+
     customer_id: int
     nombre: str
     email: str
@@ -183,19 +410,24 @@ class Customer:
     @staticmethod
     def from_dict(data: dict[str, Any]) -> Customer | None:
         """Construye un Customer de forma segura."""
+        valores = _valores_requeridos(data, _CUSTOMER_KEYS, "cliente")
+        if valores is None:
+            return None
+        cust_id, nombre, email = valores
         try:
-            cust_id = _validar_int_pos(data["id"], "customer.id")
-            nombre = _validar_str_no_vacio(data["nombre"], "customer.nombre")
-            email = _validar_str_no_vacio(data["email"], "customer.email")
+            cust_id = _validar_int_pos(cust_id, "customer.id")
+            nombre = _validar_str_no_vacio(nombre, "customer.nombre")
+            email = _validar_str_no_vacio(email, "customer.email")
             return Customer(cust_id, nombre, email)
-        except (KeyError, TypeError, ValueError) as exc:
-            print(f"ERROR: Registro de cliente inválido: {exc}")
+        except (TypeError, ValueError) as exc:
+            _log.error("Registro de cliente inválido: %s", exc)
             return None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Reservation:
     """Entidad Reservation."""
+
     reservation_id: int
     hotel_id: int
     customer_id: int
@@ -219,48 +451,272 @@ class Reservation:
     @staticmethod
     def from_dict(data: dict[str, Any]) -> Reservation | None:
         """Construye una Reservation de forma segura."""
+        valores = _valores_requeridos(data, _RESERVATION_KEYS, "reservación")
+        if valores is None:
+            return None
+        res_id, hotel_id, cust_id, habs, ini, fin, est = valores
         try:
-            res_id = _validar_int_pos(data["id"], "reservation.id")
-            hotel_id = _validar_int_pos(
-                data["hotel_id"],
-                "reservation.hotel_id",
-            )
-            cust_id = _validar_int_pos(
-                data["customer_id"], "reservation.customer_id"
-            )
-            habs = _validar_int_pos(
-                data["habitaciones"],
-                "reservation.habitaciones",
-            )
-            ini = _validar_str_no_vacio(
-                data["fecha_inicio"],
-                "reservation.fecha_inicio",
+            res_id = _validar_int_pos(res_id, "reservation.id")
+            hotel_id = _validar_int_pos(hotel_id, "reservation.hotel_id")
+            cust_id = _validar_int_pos(cust_id, "reservation.customer_id")
+            habs = _validar_int_pos(habs, "reservation.habitaciones")
+            ini = _validar_str_no_vacio(ini, "reservation.fecha_inicio")
+            fin = _validar_str_no_vacio(fin, "reservation.fecha_fin")
+            est = sys.intern(
+                _validar_str_no_vacio(est, "reservation.estatus")
             )
-            fin = _validar_str_no_vacio(
-                data["fecha_fin"],
-                "reservation.fecha_fin",
-            )
-            est = _validar_str_no_vacio(data["estatus"], "reservation.estatus")
             return Reservation(res_id, hotel_id, cust_id, habs, ini, fin, est)
-        except (KeyError, TypeError, ValueError) as exc:
-            print(f"ERROR: Registro de reservación inválido: {exc}")
+        except (TypeError, ValueError) as exc:
+            _log.error("Registro de reservación inválido: %s", exc)
             return None
 
 
+@dataclass(slots=True)
+class _EstadoArchivo:
+    """Caché en memoria de un archivo JSON y lo que se deriva de él."""
+
+    path: str
+    # None mientras el archivo no se ha cargado (o tras olvidarlo)
+    registros: list[dict[str, Any]] | None = None
+    # Firma (mtime, tamaño) del archivo al cargarlo o escribirlo
+    firma: tuple[int, int] | None = None
+    # id -> posición en registros, y el siguiente id libre
+    indice: dict[int, int] = field(default_factory=dict)
+    siguiente: int = 1
+    # Entidades ya construidas por id; se invalidan al mutar el registro
+    objetos: dict[int, Any] = field(default_factory=dict)
+
+
 class ReservationSystem:
     """Orquestador con operaciones CRUD y persistencia."""
 
-    def __init__(self, data_dir: str = DATA_DIR) -> None:
-        self._data_dir = data_dir
-        _asegurar_directorio_data(self._data_dir)
-        self._hotels_path = _ruta(self._data_dir, HOTELS_FILE)
-        self._customers_path = _ruta(self._data_dir, CUSTOMERS_FILE)
-        self._reservations_path = _ruta(self._data_dir, RESERVATIONS_FILE)
+    def __init__(
+        self,
+        data_dir: str = DATA_DIR,
+        autoguardado: bool = True,
+        legible: bool = False,
+    ) -> None:
+        """
+        Si autoguardado es False, los cambios se quedan en memoria hasta
+        llamar a guardar(). Dentro de un bloque ``with`` las escrituras
+        siempre se agrupan y se hacen al salir; si el bloque termina con
+        una excepción, los cambios pendientes se descartan (transacción).
+        Un ``with`` anidado forma parte del bloque externo: solo el más
+        externo guarda o descarta.
+
+        Con legible=True los JSON se escriben indentados para revisarlos
+        a mano; por defecto se escriben compactos.
+        """
+        _asegurar_directorio_data(data_dir)
+        self._archivos = {
+            "hotels": _EstadoArchivo(_ruta(data_dir, HOTELS_FILE)),
+            "customers": _EstadoArchivo(_ruta(data_dir, CUSTOMERS_FILE)),
+            "reservations": _EstadoArchivo(_ruta(data_dir, RESERVATIONS_FILE)),
+        }
+        # Buffer de lectura reutilizado entre recargas de archivos
+        self._buffer_lectura = bytearray(64 * 1024)
+        # Tipos cuya primera consulta ya se resolvió en streaming
+        self._consultados_en_streaming: set[str] = set()
+
+        # Tipos con cambios pendientes de escribir a disco
+        self._sucios: set[str] = set()
+        self._autoguardado = autoguardado
+        self._nivel_with = 0
+        self._legible = legible
+
+        # Asegura que existan los archivos base; cada uno se parsea hasta
+        # que se usa por primera vez, pero ya se pide su precarga
+        for estado in self._archivos.values():
+            _asegurar_archivo(estado.path)
+            _precargar_archivo(estado.path)
+
+    def __enter__(self) -> ReservationSystem:
+        self._nivel_with += 1
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        self._nivel_with -= 1
+        if self._nivel_with > 0:
+            return
+        if exc_type is not None:
+            self._descartar_cambios()
+        else:
+            self.guardar()
+
+    def guardar(self) -> bool:
+        """
+        Escribe a disco solo los archivos con cambios pendientes.
+
+        Si un archivo no se pudo escribir, sus cambios en memoria se
+        descartan (se vuelve a leer de disco) y se regresa False.
+        """
+        todo_escrito = True
+        for tipo in sorted(self._sucios):
+            try:
+                escrito = self._escribir(tipo)
+            except BaseException:
+                self._olvidar(tipo)
+                raise
+            if escrito:
+                self._sucios.discard(tipo)
+            else:
+                self._olvidar(tipo)
+                todo_escrito = False
+        return todo_escrito
+
+    def _escribir(self, tipo: str) -> bool:
+        """Escribe un tipo a disco y actualiza su firma."""
+        estado = self._archivos[tipo]
+        if not _escribir_json_lista(
+            estado.path, estado.registros, self._legible
+        ):
+            return False
+        estado.firma = _firma_archivo(estado.path)
+        return True
+
+    def _olvidar(self, tipo: str) -> None:
+        """Descarta la caché de un tipo; se recarga desde disco."""
+        self._sucios.discard(tipo)
+        estado = self._archivos[tipo]
+        estado.registros = None
+        estado.objetos = {}
+
+    def _descartar_cambios(self) -> None:
+        """Olvida los cambios pendientes; se recargan desde disco."""
+        for tipo in list(self._sucios):
+            self._olvidar(tipo)
+
+    # ---------------- Caché ----------------
+
+    def _cargar(self, tipo: str) -> list[dict[str, Any]]:
+        """
+        Regresa los registros de un archivo desde la caché.
+
+        Solo vuelve a leer y parsear el JSON si el archivo cambió en disco
+        y no hay cambios pendientes en memoria.
+        """
+        estado = self._archivos[tipo]
+        if tipo in self._sucios:
+            return estado.registros
+        firma = _firma_archivo(estado.path)
+        if estado.registros is None or firma != estado.firma:
+            registros = _leer_json_lista(estado.path, self._buffer_lectura)
+            estado.registros = registros
+            estado.indice = _indexar_por_id(registros)
+            estado.siguiente = _siguiente_id(registros)
+            estado.objetos = {}
+            # Se guarda la firma tomada antes de leer: si el archivo cambia
+            # mientras se lee, la siguiente consulta lo vuelve a cargar
+            if firma is None:
+                firma = _firma_archivo(estado.path)  # recién creado con []
+            estado.firma = firma
+        return estado.registros
+
+    def _buscar(self, tipo: str, reg_id: int) -> dict[str, Any] | None:
+        """Regresa el registro crudo con ese id, o None."""
+        registros = self._cargar(tipo)
+        pos = self._archivos[tipo].indice.get(reg_id)
+        return None if pos is None else registros[pos]
+
+    def _buscar_lectura(self, tipo: str, reg_id: int) -> dict[str, Any] | None:
+        """
+        Como _buscar, pero solo para lecturas.
+
+        Si el archivo es grande y aún no está en caché, la primera consulta
+        se resuelve en streaming y corta al encontrar el id; las
+        siguientes cargan la caché completa. El dict regresado puede no
+        ser el de la caché, así que no debe mutarse.
+        """
+        path = self._archivos[tipo].path
+        if (
+            ijson is not None
+            and self._archivos[tipo].registros is None
+            and tipo not in self._consultados_en_streaming
+        ):
+            self._consultados_en_streaming.add(tipo)
+            firma = _firma_archivo(path)
+            if firma is not None and firma[1] >= _UMBRAL_STREAMING_BYTES:
+                try:
+                    return _buscar_en_streaming(path, reg_id)
+                except (OSError, ValueError, ijson.JSONError):
+                    pass  # La carga completa reporta el error
+        return self._buscar(tipo, reg_id)
+
+    def _entidad(
+        self,
+        tipo: str,
+        reg_id: int,
+        registro: dict[str, Any],
+        desde_dict: Callable[[dict[str, Any]], Any],
+    ) -> Any:
+        """
+        Construye la entidad de un registro, reutilizándola si ya existe.
 
-        # Asegura que existan los archivos base
-        _leer_json_lista(self._hotels_path)
-        _leer_json_lista(self._customers_path)
-        _leer_json_lista(self._reservations_path)
+        Las entidades son inmutables, así que se guardan por id hasta que
+        el registro cambia (_invalidar) o el archivo se recarga.
+        """
+        estado = self._archivos[tipo]
+        if reg_id in estado.objetos:
+            return estado.objetos[reg_id]
+        entidad = desde_dict(registro)
+        # Sin caché cargada (p. ej. lectura en streaming) no se guarda
+        if entidad is not None and estado.registros is not None:
+            estado.objetos[reg_id] = entidad
+        return entidad
+
+    def _invalidar(self, tipo: str, reg_id: int) -> None:
+        """Olvida la entidad construida de un registro que cambió."""
+        self._archivos[tipo].objetos.pop(reg_id, None)
+
+    def _marcar(self, *tipos: str) -> None:
+        """Marca tipos con cambios; escribe ya si aplica autoguardado."""
+        self._sucios.update(tipos)
+        if self._autoguardado and self._nivel_with == 0:
+            self.guardar()
+
+    def _nuevo_id(self, tipo: str) -> int:
+        """Reserva el siguiente id de un tipo en O(1)."""
+        self._cargar(tipo)
+        estado = self._archivos[tipo]
+        new_id = estado.siguiente
+        estado.siguiente = new_id + 1
+        return new_id
+
+    def _agregar(self, tipo: str, registro: dict[str, Any]) -> None:
+        """Agrega un registro nuevo a la caché y a su índice."""
+        estado = self._archivos[tipo]
+        estado.indice[registro["id"]] = len(estado.registros)
+        estado.registros.append(registro)
+
+    def _eliminar(self, tipo: str, reg_id: int) -> bool:
+        """
+        Elimina un registro por id, en sitio y sin copiar la lista.
+
+        Solo se visitan los registros posteriores, para ajustar su
+        posición en el índice.
+        """
+        registros = self._cargar(tipo)
+        estado = self._archivos[tipo]
+        indice = estado.indice
+        pos = indice.pop(reg_id, None)
+        if pos is None:
+            return False
+        self._invalidar(tipo, reg_id)
+        del registros[pos]
+        for nueva_pos in range(pos, len(registros)):
+            otro_id = registros[nueva_pos].get("id")
+            if not isinstance(otro_id, int):
+                continue
+            if indice.get(otro_id) == nueva_pos + 1:
+                indice[otro_id] = nueva_pos
+            elif otro_id == reg_id:
+                # Un id repetido ocupa el lugar del eliminado en el índice
+                indice.setdefault(reg_id, nueva_pos)
+        if reg_id == estado.siguiente - 1:
+            # Igual que antes: si se borra el máximo, su id se reutiliza
+            estado.siguiente = _siguiente_id(registros)
+        self._marcar(tipo)
+        return True
 
     # ---------------- Hotels ----------------
 
@@ -275,33 +731,27 @@ class ReservationSystem:
         ubicacion = _validar_str_no_vacio(ubicacion, "ubicacion")
         total = _validar_int_pos(habitaciones_total, "habitaciones_total")
 
-        hoteles = _leer_json_lista(self._hotels_path)
-        new_id = _siguiente_id(hoteles)
-        hotel = Hotel(new_id, nombre, ubicacion, total, total)
-        hoteles.append(hotel.to_dict())
-        _escribir_json_lista(self._hotels_path, hoteles)
+        new_id = self._nuevo_id("hotels")
+        hotel = Hotel(new_id, nombre, ubicacion, total, total).to_dict()
+        self._agregar("hotels", hotel)
+        self._marcar("hotels")
         return new_id
 
     def eliminar_hotel(self, hotel_id: int) -> bool:
         """Elimina un hotel por id. True si lo eliminó."""
         hotel_id = _validar_int_pos(hotel_id, "hotel_id")
-        hoteles = _leer_json_lista(self._hotels_path)
-        before = len(hoteles)
-        hoteles = [h for h in hoteles if h.get("id") != hotel_id]
-        _escribir_json_lista(self._hotels_path, hoteles)
-        return len(hoteles) < before
+        return self._eliminar("hotels", hotel_id)
 
     def obtener_hotel(self, hotel_id: int) -> Hotel | None:
         """Obtiene un hotel por id (parseo seguro)."""
         hotel_id = _validar_int_pos(hotel_id, "hotel_id")
-        hoteles = _leer_json_lista(self._hotels_path)
-        for h in hoteles:
-            if h.get("id") == hotel_id:
-                hotel = Hotel.from_dict(h)
-                if hotel is None:
-                    print("ERROR: Hotel corrupto, se omite.")
-                return hotel
-        return None
+        h = self._buscar_lectura("hotels", hotel_id)
+        if h is None:
+            return None
+        hotel = self._entidad("hotels", hotel_id, h, Hotel.from_dict)
+        if hotel is None:
+            _log.error("Hotel corrupto, se omite.")
+        return hotel
 
     def modificar_hotel(
         self,
@@ -314,24 +764,80 @@ class ReservationSystem:
         No modifica totales/disponibles aquí (eso lo maneja reservación).
         """
         hotel_id = _validar_int_pos(hotel_id, "hotel_id")
-        hoteles = _leer_json_lista(self._hotels_path)
+        # Se valida antes de tocar los registros en caché
+        if nombre is not None:
+            nombre = _validar_str_no_vacio(nombre, "nombre")
+        if ubicacion is not None:
+            ubicacion = _validar_str_no_vacio(ubicacion, "ubicacion")
+
+        h = self._buscar("hotels", hotel_id)
+        if h is None or (nombre is None and ubicacion is None):
+            return False
 
-        cambiado = False
-        for h in hoteles:
-            if h.get("id") != hotel_id:
-                continue
+        if nombre is not None:
+            h["nombre"] = nombre
+        if ubicacion is not None:
+            h["ubicacion"] = ubicacion
+        self._invalidar("hotels", hotel_id)
+        self._marcar("hotels")
+        return True
 
-            if nombre is not None:
-                h["nombre"] = _validar_str_no_vacio(nombre, "nombre")
-                cambiado = True
+    def buscar_hoteles_disponibles(
+        self,
+        ubicacion: str,
+        habitaciones: int = 1,
+    ) -> list[Hotel]:
+        """
+        Lista los hoteles de una ubicación con al menos N habitaciones
+        disponibles. Los registros corruptos se omiten.
+        """
+        ubicacion = _validar_str_no_vacio(ubicacion, "ubicacion")
+        habitaciones = _validar_int_pos(habitaciones, "habitaciones")
 
-            if ubicacion is not None:
-                h["ubicacion"] = _validar_str_no_vacio(ubicacion, "ubicacion")
-                cambiado = True
+        encontrados: list[Hotel] = []
+        registros = self._cargar("hotels")
+        indice = self._archivos["hotels"].indice
+        for pos, h in enumerate(registros):
+            disp = h.get("habitaciones_disponibles")
+            if not isinstance(disp, int) or disp < habitaciones:
+                continue
+            # Como en Hotel.from_dict, la ubicación se compara sin espacios
+            ubic = h.get("ubicacion")
+            if not isinstance(ubic, str) or ubic.strip() != ubicacion:
+                continue
+            # Reutiliza la entidad de obtener_hotel solo si este es el
+            # registro indexado con ese id (no un duplicado)
+            hotel_id = h.get("id")
+            if isinstance(hotel_id, int) and indice.get(hotel_id) == pos:
+                hotel = self._entidad("hotels", hotel_id, h, Hotel.from_dict)
+            else:
+                hotel = Hotel.from_dict(h)
+            if hotel is not None:
+                encontrados.append(hotel)
+        return encontrados
 
-        if cambiado:
-            _escribir_json_lista(self._hotels_path, hoteles)
-        return cambiado
+    def hay_disponibilidad(
+        self,
+        hotel_ids: Iterable[int],
+        habitaciones: int = 1,
+    ) -> bool:
+        """
+        True si alguno de los hoteles tiene al menos N habitaciones
+        disponibles. Los ids inexistentes o corruptos se ignoran.
+        """
+        habitaciones = _validar_int_pos(habitaciones, "habitaciones")
+        for hotel_id in hotel_ids:
+            hotel_id = _validar_int_pos(hotel_id, "hotel_id")
+            h = self._buscar("hotels", hotel_id)
+            if h is None:
+                continue
+            # Misma validación que crear_reservacion
+            hotel = self._entidad("hotels", hotel_id, h, Hotel.from_dict)
+            if hotel is None:
+                continue
+            if hotel.habitaciones_disponibles >= habitaciones:
+                return True
+        return False
 
     # ---------------- Customers ----------------
 
@@ -340,33 +846,29 @@ class ReservationSystem:
         nombre = _validar_str_no_vacio(nombre, "nombre")
         email = _validar_str_no_vacio(email, "email")
 
-        clientes = _leer_json_lista(self._customers_path)
-        new_id = _siguiente_id(clientes)
-        cliente = Customer(new_id, nombre, email)
-        clientes.append(cliente.to_dict())
-        _escribir_json_lista(self._customers_path, clientes)
+        new_id = self._nuevo_id("customers")
+        cliente = Customer(new_id, nombre, email).to_dict()
+        self._agregar("customers", cliente)
+        self._marcar("customers")
         return new_id
 
     def eliminar_cliente(self, customer_id: int) -> bool:
         """Elimina un cliente por id. True si lo eliminó."""
         customer_id = _validar_int_pos(customer_id, "customer_id")
-        clientes = _leer_json_lista(self._customers_path)
-        before = len(clientes)
-        clientes = [c for c in clientes if c.get("id") != customer_id]
-        _escribir_json_lista(self._customers_path, clientes)
-        return len(clientes) < before
+        return self._eliminar("customers", customer_id)
 
     def obtener_cliente(self, customer_id: int) -> Customer | None:
         """Obtiene un cliente por id (parseo seguro)."""
         customer_id = _validar_int_pos(customer_id, "customer_id")
-        clientes = _leer_json_lista(self._customers_path)
-        for c in clientes:
-            if c.get("id") == customer_id:
-                cliente = Customer.from_dict(c)
-                if cliente is None:
-                    print("ERROR: Cliente corrupto, se omite.")
-                return cliente
-        return None
+        c = self._buscar_lectura("customers", customer_id)
+        if c is None:
+            return None
+        cliente = self._entidad(
+            "customers", customer_id, c, Customer.from_dict
+        )
+        if cliente is None:
+            _log.error("Cliente corrupto, se omite.")
+        return cliente
 
     def modificar_cliente(
         self,
@@ -376,24 +878,23 @@ class ReservationSystem:
     ) -> bool:
         """Modifica campos de un cliente."""
         customer_id = _validar_int_pos(customer_id, "customer_id")
-        clientes = _leer_json_lista(self._customers_path)
-
-        cambiado = False
-        for c in clientes:
-            if c.get("id") != customer_id:
-                continue
-
-            if nombre is not None:
-                c["nombre"] = _validar_str_no_vacio(nombre, "nombre")
-                cambiado = True
-
-            if email is not None:
-                c["email"] = _validar_str_no_vacio(email, "email")
-                cambiado = True
+        # Se valida antes de tocar los registros en caché
+        if nombre is not None:
+            nombre = _validar_str_no_vacio(nombre, "nombre")
+        if email is not None:
+            email = _validar_str_no_vacio(email, "email")
+
+        c = self._buscar("customers", customer_id)
+        if c is None or (nombre is None and email is None):
+            return False
 
-        if cambiado:
-            _escribir_json_lista(self._customers_path, clientes)
-        return cambiado
+        if nombre is not None:
+            c["nombre"] = nombre
+        if email is not None:
+            c["email"] = email
+        self._invalidar("customers", customer_id)
+        self._marcar("customers")
+        return True
 
     # ---------------- Reservations ----------------
 
@@ -416,29 +917,21 @@ class ReservationSystem:
         fecha_inicio = _validar_str_no_vacio(fecha_inicio, "fecha_inicio")
         fecha_fin = _validar_str_no_vacio(fecha_fin, "fecha_fin")
 
+        # Valida todo sobre la caché antes de mutar
         if self.obtener_cliente(customer_id) is None:
             raise ValueError("El cliente no existe.")
 
-        hotel = self.obtener_hotel(hotel_id)
+        h = self._buscar("hotels", hotel_id)
+        hotel = None
+        if h is not None:
+            hotel = self._entidad("hotels", hotel_id, h, Hotel.from_dict)
         if hotel is None:
             raise ValueError("El hotel no existe o está corrupto.")
 
         if hotel.habitaciones_disponibles < habitaciones:
             raise ValueError("No hay habitaciones disponibles suficientes.")
 
-        # Actualiza hotel (descuenta disponibilidad)
-        hoteles = _leer_json_lista(self._hotels_path)
-        for h in hoteles:
-            if h.get("id") == hotel_id:
-                disp = h.get("habitaciones_disponibles")
-                if not isinstance(disp, int):
-                    raise ValueError("Hotel corrupto: disponibles inválidas.")
-                h["habitaciones_disponibles"] = disp - habitaciones
-        _escribir_json_lista(self._hotels_path, hoteles)
-
-        # Crea reservación
-        reservaciones = _leer_json_lista(self._reservations_path)
-        new_id = _siguiente_id(reservaciones)
+        new_id = self._nuevo_id("reservations")
         reserva = Reservation(
             reservation_id=new_id,
             hotel_id=hotel_id,
@@ -446,55 +939,62 @@ class ReservationSystem:
             habitaciones=habitaciones,
             fecha_inicio=fecha_inicio,
             fecha_fin=fecha_fin,
-            estatus="activa",
+            estatus=_ACTIVA,
+        ).to_dict()
+
+        # Descuenta disponibilidad y registra la reservación; ambos
+        # archivos se escriben juntos
+        h["habitaciones_disponibles"] = (
+            hotel.habitaciones_disponibles - habitaciones
         )
-        reservaciones.append(reserva.to_dict())
-        _escribir_json_lista(self._reservations_path, reservaciones)
+        self._invalidar("hotels", hotel_id)
+        self._agregar("reservations", reserva)
+        self._marcar("hotels", "reservations")
         return new_id
 
     def cancelar_reservacion(self, reservation_id: int) -> bool:
         reservation_id = _validar_int_pos(reservation_id, "reservation_id")
-        reservaciones = _leer_json_lista(self._reservations_path)
-
-        reserva_obj: Reservation | None = None
-        for r in reservaciones:
-            if r.get("id") == reservation_id:
-                reserva_obj = Reservation.from_dict(r)
-                if reserva_obj is None:
-                    print("ERROR: Reservación corrupta, se omite.")
-                    return False
-                if r.get("estatus") == "cancelada":
-                    return False
-                r["estatus"] = "cancelada"
-                break
+        r = self._buscar("reservations", reservation_id)
+        if r is None:
+            return False
 
+        reserva_obj = self._entidad(
+            "reservations", reservation_id, r, Reservation.from_dict
+        )
         if reserva_obj is None:
+            _log.error("Reservación corrupta, se omite.")
+            return False
+        if reserva_obj.estatus is _CANCELADA:
             return False
-
-        _escribir_json_lista(self._reservations_path, reservaciones)
 
         # Regresa disponibilidad al hotel
-        hoteles = _leer_json_lista(self._hotels_path)
-        for h in hoteles:
-            if h.get("id") == reserva_obj.hotel_id:
-                disp = h.get("habitaciones_disponibles")
-                total = h.get("habitaciones_total")
-                if not isinstance(disp, int) or not isinstance(total, int):
-                    print("ERROR: Hotel corrupto al reponer disponibilidad.")
-                    return True
-                nuevo = disp + reserva_obj.habitaciones
-                h["habitaciones_disponibles"] = min(nuevo, total)
-        _escribir_json_lista(self._hotels_path, hoteles)
+        h = self._buscar("hotels", reserva_obj.hotel_id)
+        r["estatus"] = _CANCELADA
+        self._invalidar("reservations", reservation_id)
+        if h is None:
+            self._marcar("reservations")
+            return True
+        disp = h.get("habitaciones_disponibles")
+        total = h.get("habitaciones_total")
+        if not isinstance(disp, int) or not isinstance(total, int):
+            _log.error("Hotel corrupto al reponer disponibilidad.")
+            self._marcar("reservations")
+            return True
+        nuevo = disp + reserva_obj.habitaciones
+        h["habitaciones_disponibles"] = min(nuevo, total)
+        self._invalidar("hotels", reserva_obj.hotel_id)
+        self._marcar("hotels", "reservations")
         return True
 
     def obtener_reservacion(self, reservation_id: int) -> Reservation | None:
         """Obtiene una reservación por id (parseo seguro)."""
         reservation_id = _validar_int_pos(reservation_id, "reservation_id")
-        reservaciones = _leer_json_lista(self._reservations_path)
-        for r in reservaciones:
-            if r.get("id") == reservation_id:
-                reserva = Reservation.from_dict(r)
-                if reserva is None:
-                    print("ERROR: Reservación corrupta, se omite.")
-                return reserva
-        return None
+        r = self._buscar_lectura("reservations", reservation_id)
+        if r is None:
+            return None
+        reserva = self._entidad(
+            "reservations", reservation_id, r, Reservation.from_dict
+        )
+        if reserva is None:
+            _log.error("Reservación corrupta, se omite.")
+        return reserva
@@ -1,9 +1,19 @@
+import copy
 import json
 import os
+import pickle
 import tempfile
+import types
 import unittest
+from unittest import mock
 
-from reservation_system import ReservationSystem
+import reservation_system
+from reservation_system import (
+    Customer,
+    Hotel,
+    Reservation,
+    ReservationSystem,
+)
 
 
 class TestReservationSystem(unittest.TestCase):
@@ -36,6 +46,148 @@ class TestReservationSystem(unittest.TestCase):
         self.assertTrue(ok)
         self.assertIsNone(self.system.obtener_hotel(hotel_id))
 
+    def test_eliminar_hotel_conserva_los_demas(self):
+        ids = [
+            self.system.crear_hotel(f"Hotel {i}", "Puebla", 10)
+            for i in range(3)
+        ]
+        self.assertTrue(self.system.eliminar_hotel(ids[1]))
+        self.assertFalse(self.system.eliminar_hotel(ids[1]))
+        self.assertEqual(self.system.obtener_hotel(ids[0]).nombre, "Hotel 0")
+        self.assertEqual(self.system.obtener_hotel(ids[2]).nombre, "Hotel 2")
+        self.assertIsNone(self.system.obtener_hotel(ids[1]))
+
+    def test_eliminar_cliente_ajusta_indice(self):
+        customers_path = os.path.join(self.tmp.name, "customers.json")
+        with open(customers_path, "w", encoding="utf-8") as f_out:
+            json.dump([
+                {"id": 1, "nombre": "Ana", "email": "a@test.com"},
+                {"id": "x"},
+                {"id": 1, "nombre": "Ana 2", "email": "a2@test.com"},
+                {"id": 2, "nombre": "Bo", "email": "b@test.com"},
+            ], f_out)
+
+        self.assertTrue(self.system.eliminar_cliente(1))
+        self.assertEqual(self.system.obtener_cliente(1).nombre, "Ana 2")
+        self.assertEqual(self.system.obtener_cliente(2).nombre, "Bo")
+
+    def test_ids_consecutivos(self):
+        ids = [self.system.crear_cliente("Ana", "a@test.com") for _ in "abc"]
+        self.assertEqual(ids, [1, 2, 3])
+        self.system.eliminar_cliente(3)
+        self.assertEqual(self.system.crear_cliente("Bo", "b@test.com"), 3)
+
+    def test_hotel_ida_y_vuelta_sin_dict(self):
+        hotel = Hotel(1, "Hotel A", "Puebla", 10, 8)
+        self.assertEqual(Hotel.from_dict(hotel.to_dict()), hotel)
+        self.assertFalse(hasattr(hotel, "__dict__"))
+
+    def test_entidades_copia_y_pickle(self):
+        entidades = (
+            Hotel(1, "Hotel A", "Puebla", 10, 8),
+            Customer(1, "Ana", "ana@test.com"),
+            Reservation(1, 1, 1, 2, "2026-02-22", "2026-02-23", "activa"),
+        )
+        for entidad in entidades:
+            for copia in (
+                copy.copy(entidad),
+                copy.deepcopy(entidad),
+                pickle.loads(pickle.dumps(entidad)),
+            ):
+                self.assertEqual(copia, entidad)
+
+    def test_obtener_hotel_reutiliza_entidad(self):
+        hid = self.system.crear_hotel("Hotel A", "Puebla", 5)
+        hotel = self.system.obtener_hotel(hid)
+        self.assertIs(self.system.obtener_hotel(hid), hotel)
+
+        self.system.modificar_hotel(hid, nombre="Hotel B")
+        self.assertEqual(self.system.obtener_hotel(hid).nombre, "Hotel B")
+
+    def test_buscar_hoteles_disponibles(self):
+        h1 = self.system.crear_hotel("Hotel A", "Puebla", 5)
+        self.system.crear_hotel("Hotel B", "Puebla", 1)
+        self.system.crear_hotel("Hotel C", "Cholula", 9)
+
+        encontrados = self.system.buscar_hoteles_disponibles("Puebla", 2)
+        self.assertEqual([h.hotel_id for h in encontrados], [h1])
+        self.assertIs(encontrados[0], self.system.obtener_hotel(h1))
+
+        cid = self.system.crear_cliente("Ana", "ana@test.com")
+        self.system.crear_reservacion(cid, h1, 4, "2026-02-22", "2026-02-24")
+        encontrados = self.system.buscar_hoteles_disponibles("Puebla", 2)
+        self.assertEqual(encontrados, [])
+
+    def test_buscar_hoteles_ubicacion_con_espacios(self):
+        hotels_path = os.path.join(self.tmp.name, "hotels.json")
+        with open(hotels_path, "w", encoding="utf-8") as f_out:
+            json.dump([{
+                "id": 1,
+                "nombre": "Hotel A",
+                "ubicacion": " Puebla ",
+                "habitaciones_total": 4,
+                "habitaciones_disponibles": 4,
+            }], f_out)
+
+        encontrados = self.system.buscar_hoteles_disponibles("Puebla")
+        self.assertEqual([h.ubicacion for h in encontrados], ["Puebla"])
+
+    def test_buscar_hoteles_id_repetido(self):
+        hotels_path = os.path.join(self.tmp.name, "hotels.json")
+        with open(hotels_path, "w", encoding="utf-8") as f_out:
+            json.dump([
+                {
+                    "id": 1,
+                    "nombre": f"Hotel {letra}",
+                    "ubicacion": "Puebla",
+                    "habitaciones_total": 4,
+                    "habitaciones_disponibles": 4,
+                }
+                for letra in "AB"
+            ], f_out)
+
+        encontrados = self.system.buscar_hoteles_disponibles("Puebla")
+        nombres = [h.nombre for h in encontrados]
+        self.assertEqual(nombres, ["Hotel A", "Hotel B"])
+        self.assertIs(encontrados[0], self.system.obtener_hotel(1))
+
+    def test_hay_disponibilidad(self):
+        h1 = self.system.crear_hotel("Hotel A", "Puebla", 2)
+        h2 = self.system.crear_hotel("Hotel B", "Puebla", 4)
+        self.assertTrue(self.system.hay_disponibilidad([h1, h2], 3))
+        self.assertFalse(self.system.hay_disponibilidad([h1, 999], 3))
+        self.assertFalse(self.system.hay_disponibilidad([], 1))
+
+    def test_hay_disponibilidad_ignora_hotel_corrupto(self):
+        hotels_path = os.path.join(self.tmp.name, "hotels.json")
+        with open(hotels_path, "w", encoding="utf-8") as f_out:
+            json.dump([
+                {"id": 1, "habitaciones_disponibles": 9},
+                {
+                    "id": 2,
+                    "nombre": "Hotel B",
+                    "ubicacion": "Puebla",
+                    "habitaciones_total": 3,
+                    "habitaciones_disponibles": 9,
+                },
+                {
+                    "id": 3,
+                    "nombre": "Hotel C",
+                    "ubicacion": "Puebla",
+                    "habitaciones_total": True,
+                    "habitaciones_disponibles": True,
+                },
+            ], f_out)
+
+        with self.assertLogs("reservation_system", "ERROR"):
+            self.assertFalse(self.system.hay_disponibilidad([1, 2, 3], 1))
+
+    def test_from_dict_no_dict_regresa_none(self):
+        for entidad in (Hotel, Customer, Reservation):
+            for data in (["x"], "x", None):
+                with self.assertLogs("reservation_system", "ERROR"):
+                    self.assertIsNone(entidad.from_dict(data))
+
     def test_crear_y_obtener_cliente(self):
         cid = self.system.crear_cliente("Ana", "ana@test.com")
         cliente = self.system.obtener_cliente(cid)
@@ -82,6 +234,272 @@ class TestReservationSystem(unittest.TestCase):
         hotel = self.system.obtener_hotel(hid)
         self.assertEqual(hotel.habitaciones_disponibles, 5)
 
+    def test_cambio_durante_lectura_se_recarga(self):
+        hid = self.system.crear_hotel("Hotel A", "Puebla", 10)
+        hotels_path = os.path.join(self.tmp.name, "hotels.json")
+        leer_original = reservation_system._leer_json_lista
+
+        def leer_y_cambiar(path, buffer=None):
+            registros = leer_original(path, buffer)
+            # Otro proceso escribe justo después de la lectura
+            with open(hotels_path, "w", encoding="utf-8") as f_out:
+                json.dump([{
+                    "id": hid,
+                    "nombre": "Hotel Externo",
+                    "ubicacion": "Cholula",
+                    "habitaciones_total": 4,
+                    "habitaciones_disponibles": 4,
+                }], f_out)
+            return registros
+
+        system = ReservationSystem(data_dir=self.tmp.name)
+        with mock.patch.object(
+            reservation_system, "_leer_json_lista", leer_y_cambiar
+        ):
+            self.assertEqual(system.obtener_hotel(hid).nombre, "Hotel A")
+        self.assertEqual(system.obtener_hotel(hid).nombre, "Hotel Externo")
+
+    def test_init_no_parsea_archivos(self):
+        data_dir = os.path.join(self.tmp.name, "nuevo")
+        with mock.patch.object(reservation_system, "_leer_json_lista") as leer:
+            ReservationSystem(data_dir=data_dir)
+        leer.assert_not_called()
+        for nombre in ("hotels.json", "customers.json", "reservations.json"):
+            with open(os.path.join(data_dir, nombre), "rb") as f_in:
+                self.assertEqual(f_in.read(), b"[]")
+
+    @unittest.skipIf(reservation_system.ijson is None, "requiere ijson")
+    def test_consulta_en_frio_por_streaming(self):
+        rid = self.system.crear_reservacion(
+            self.system.crear_cliente("Ana", "ana@test.com"),
+            self.system.crear_hotel("Hotel A", "Puebla", 5),
+            1, "2026-02-22", "2026-02-24",
+        )
+        with mock.patch.object(
+            reservation_system, "_UMBRAL_STREAMING_BYTES", 1
+        ):
+            system = ReservationSystem(data_dir=self.tmp.name)
+            reserva = system.obtener_reservacion(rid)
+        self.assertEqual(reserva.reservation_id, rid)
+
+    def test_consulta_en_frio_con_ijson_simulado(self):
+        for nombre in ("Ana", "Bo", "Cy"):
+            self.system.crear_cliente(nombre, f"{nombre}@test.com")
+        self.system.crear_hotel("Hotel A", "Puebla", 5)
+        consumidos = []
+
+        class JSONError(Exception):
+            """Error de ijson simulado."""
+
+        def items(f_in, prefijo):
+            self.assertEqual(prefijo, "item")
+            for item in json.load(f_in):
+                consumidos.append(item["id"])
+                yield item
+
+        def items_con_error(f_in, prefijo):
+            raise JSONError("json roto")
+
+        ijson_falso = types.SimpleNamespace(items=items, JSONError=JSONError)
+        with mock.patch.multiple(
+            reservation_system, ijson=ijson_falso, _UMBRAL_STREAMING_BYTES=1
+        ):
+            system = ReservationSystem(data_dir=self.tmp.name)
+            # Corta en cuanto encuentra el id
+            self.assertEqual(system.obtener_cliente(2).nombre, "Bo")
+            self.assertEqual(consumidos, [1, 2])
+            # Solo la primera consulta va en streaming; luego carga completa
+            self.assertEqual(system.obtener_cliente(3).nombre, "Cy")
+            self.assertEqual(consumidos, [1, 2])
+
+            # Si el streaming falla, se resuelve con la carga completa
+            ijson_falso.items = items_con_error
+            self.assertEqual(system.obtener_hotel(1).nombre, "Hotel A")
+
+    def test_cache_detecta_cambio_externo(self):
+        hid = self.system.crear_hotel("Hotel A", "Puebla", 10)
+        self.assertEqual(self.system.obtener_hotel(hid).nombre, "Hotel A")
+
+        # Otro proceso reescribe hotels.json por fuera del sistema
+        hotels_path = os.path.join(self.tmp.name, "hotels.json")
+        with open(hotels_path, "w", encoding="utf-8") as f_out:
+            json.dump([{
+                "id": hid,
+                "nombre": "Hotel Externo",
+                "ubicacion": "Cholula",
+                "habitaciones_total": 4,
+                "habitaciones_disponibles": 4,
+            }], f_out)
+
+        hotel = self.system.obtener_hotel(hid)
+        self.assertEqual(hotel.nombre, "Hotel Externo")
+
+    def test_with_agrupa_escrituras(self):
+        hotels_path = os.path.join(self.tmp.name, "hotels.json")
+        with ReservationSystem(data_dir=self.tmp.name) as system:
+            hid = system.crear_hotel("Hotel A", "Puebla", 10)
+            system.modificar_hotel(hid, nombre="Hotel B")
+            with open(hotels_path, "r", encoding="utf-8") as f_in:
+                self.assertEqual(json.load(f_in), [])
+
+        with open(hotels_path, "r", encoding="utf-8") as f_in:
+            hoteles = json.load(f_in)
+        self.assertEqual(hoteles[0]["nombre"], "Hotel B")
+
+    def test_guardar_varios_archivos(self):
+        with self.system:
+            hid = self.system.crear_hotel("Hotel A", "Puebla", 5)
+            cid = self.system.crear_cliente("Ana", "ana@test.com")
+            rid = self.system.crear_reservacion(
+                cid, hid, 2, "2026-02-22", "2026-02-24"
+            )
+
+        otro = ReservationSystem(data_dir=self.tmp.name)
+        self.assertIsNotNone(otro.obtener_cliente(cid))
+        self.assertEqual(otro.obtener_hotel(hid).habitaciones_disponibles, 3)
+        self.assertEqual(otro.obtener_reservacion(rid).habitaciones, 2)
+
+    def test_escritura_fallida_vuelve_a_leer_disco(self):
+        hid = self.system.crear_hotel("Hotel A", "Puebla", 5)
+        with mock.patch.object(
+            reservation_system.os, "replace", side_effect=OSError("disco")
+        ):
+            with self.assertLogs("reservation_system", "ERROR"):
+                self.system.modificar_hotel(hid, nombre="Hotel B")
+
+        self.assertEqual(self.system.obtener_hotel(hid).nombre, "Hotel A")
+        self.assertEqual(
+            sorted(os.listdir(self.tmp.name)),
+            ["customers.json", "hotels.json", "reservations.json"],
+        )
+        # Los siguientes cambios se guardan normalmente
+        self.assertTrue(self.system.modificar_hotel(hid, nombre="Hotel C"))
+        otro = ReservationSystem(data_dir=self.tmp.name)
+        self.assertEqual(otro.obtener_hotel(hid).nombre, "Hotel C")
+
+    def test_guardar_reporta_falla(self):
+        system = ReservationSystem(data_dir=self.tmp.name, autoguardado=False)
+        system.crear_cliente("Ana", "ana@test.com")
+        with mock.patch.object(
+            reservation_system.os, "replace", side_effect=OSError("disco")
+        ):
+            with self.assertLogs("reservation_system", "ERROR"):
+                self.assertFalse(system.guardar())
+        self.assertIsNone(system.obtener_cliente(1))
+        self.assertTrue(system.guardar())
+
+    def test_with_con_excepcion_descarta_cambios(self):
+        hid = self.system.crear_hotel("Hotel A", "Puebla", 5)
+        cid = self.system.crear_cliente("Ana", "ana@test.com")
+        with self.assertRaises(ValueError):
+            with self.system:
+                self.system.crear_reservacion(
+                    cid, hid, 2, "2026-02-22", "2026-02-24"
+                )
+                self.system.crear_reservacion(
+                    cid, hid, 9, "2026-02-22", "2026-02-24"
+                )
+
+        hotel = self.system.obtener_hotel(hid)
+        self.assertEqual(hotel.habitaciones_disponibles, 5)
+        self.assertIsNone(self.system.obtener_reservacion(1))
+
+    def test_with_anidado_con_excepcion_conserva_bloque_externo(self):
+        with self.system:
+            hid = self.system.crear_hotel("Hotel A", "Puebla", 5)
+            try:
+                with self.system:
+                    self.system.crear_cliente("Ana", "ana@test.com")
+                    raise RuntimeError("falla interna")
+            except RuntimeError:
+                pass
+
+        otro = ReservationSystem(data_dir=self.tmp.name)
+        self.assertEqual(otro.obtener_hotel(hid).nombre, "Hotel A")
+        self.assertIsNotNone(otro.obtener_cliente(1))
+
+    def test_sin_autoguardado_requiere_guardar(self):
+        system = ReservationSystem(data_dir=self.tmp.name, autoguardado=False)
+        cid = system.crear_cliente("Ana", "ana@test.com")
+        self.assertIsNone(self.system.obtener_cliente(cid))
+
+        system.guardar()
+        self.assertIsNotNone(self.system.obtener_cliente(cid))
+
+    def test_json_compacto_y_legible(self):
+        customers_path = os.path.join(self.tmp.name, "customers.json")
+        self.system.crear_cliente("Ñoño", "n@test.com")
+        with open(customers_path, "r", encoding="utf-8") as f_in:
+            contenido = f_in.read()
+        self.assertNotIn("\n", contenido)
+        self.assertIn("Ñoño", contenido)
+
+        system = ReservationSystem(data_dir=self.tmp.name, legible=True)
+        system.crear_cliente("Ana", "ana@test.com")
+        with open(customers_path, "r", encoding="utf-8") as f_in:
+            contenido = f_in.read()
+        self.assertIn("\n  ", contenido)
+        self.assertEqual(len(json.loads(contenido)), 2)
+
+    def test_enteros_fuera_de_64_bits(self):
+        total = 2 ** 70
+        hid = self.system.crear_hotel("Hotel A", "Puebla", total)
+        self.assertIsNotNone(self.system.crear_cliente("Ana", "a@test.com"))
+
+        otro = ReservationSystem(data_dir=self.tmp.name)
+        self.assertEqual(otro.obtener_hotel(hid).habitaciones_total, total)
+        with mock.patch.object(reservation_system, "_UMBRAL_MMAP_BYTES", 1):
+            otro = ReservationSystem(data_dir=self.tmp.name)
+            hotel = otro.obtener_hotel(hid)
+        self.assertEqual(hotel.habitaciones_disponibles, total)
+
+    def test_lectura_con_mmap(self):
+        hid = self.system.crear_hotel("Hotel A", "Puebla", 10)
+        with mock.patch.object(reservation_system, "_UMBRAL_MMAP_BYTES", 1):
+            system = ReservationSystem(data_dir=self.tmp.name)
+            hotel = system.obtener_hotel(hid)
+        self.assertEqual(hotel.nombre, "Hotel A")
+
+    def test_reservacion_persiste_hotel_y_reservacion(self):
+        hid = self.system.crear_hotel("Hotel A", "Puebla", 4)
+        cid = self.system.crear_cliente("Ana", "ana@test.com")
+        rid = self.system.crear_reservacion(
+            cid, hid, 3, "2026-02-22", "2026-02-24"
+        )
+
+        otro = ReservationSystem(data_dir=self.tmp.name)
+        self.assertEqual(otro.obtener_hotel(hid).habitaciones_disponibles, 1)
+        self.assertEqual(otro.obtener_reservacion(rid).estatus, "activa")
+
+    def test_escritura_atomica_no_deja_temporales(self):
+        self.system.crear_hotel("Hotel A", "Puebla", 10)
+        self.assertEqual(
+            sorted(os.listdir(self.tmp.name)),
+            ["customers.json", "hotels.json", "reservations.json"],
+        )
+
+    def test_cancelar_dos_veces_no_repone_de_mas(self):
+        hid = self.system.crear_hotel("Hotel A", "Puebla", 5)
+        cid = self.system.crear_cliente("Ana", "ana@test.com")
+        rid = self.system.crear_reservacion(
+            cid, hid, 2, "2026-02-22", "2026-02-24"
+        )
+        self.assertTrue(self.system.cancelar_reservacion(rid))
+
+        otro = ReservationSystem(data_dir=self.tmp.name)
+        self.assertFalse(otro.cancelar_reservacion(rid))
+        self.assertEqual(otro.obtener_reservacion(rid).estatus, "cancelada")
+        self.assertEqual(otro.obtener_hotel(hid).habitaciones_disponibles, 5)
+
+    def test_lectura_con_buffer_reutilizable(self):
+        path = os.path.join(self.tmp.name, "lista.json")
+        buffer = bytearray(4)
+        for datos in ([{"id": 1, "nombre": "x" * 100}], [{"id": 2}]):
+            with open(path, "w", encoding="utf-8") as f_out:
+                json.dump(datos, f_out)
+            leidos = reservation_system._leer_json_lista(path, buffer)
+            self.assertEqual(leidos, datos)
+
     # ---------------- NEGATIVOS (>= 5) ----------------
 
     def test_reservacion_sin_cliente_falla(self):
@@ -114,6 +532,11 @@ class TestReservationSystem(unittest.TestCase):
                 cid, hid, 2, "2026-02-22", "2026-02-23"
             )
 
+    def test_crear_hotel_valores_invalidos(self):
+        for nombre, total in (("  ", 5), ("Hotel A", True), ("Hotel A", 0)):
+            with self.assertRaises(ValueError):
+                self.system.crear_hotel(nombre, "Puebla", total)
+
     def test_cancelar_reservacion_inexistente(self):
         ok = self.system.cancelar_reservacion(999)
         self.assertFalse(ok)
@@ -124,8 +547,30 @@ class TestReservationSystem(unittest.TestCase):
         with open(hotels_path, "w", encoding="utf-8") as f_out:
             f_out.write("{not json}")
 
-        # Debe regresar None, pero no explotar
-        self.assertIsNone(self.system.obtener_hotel(1))
+        # Debe regresar None y registrar el error, pero no explotar
+        with self.assertLogs("reservation_system", "ERROR") as logs:
+            self.assertIsNone(self.system.obtener_hotel(1))
+        self.assertIn("JSON inválido", logs.output[0])
+
+    def test_json_corrupto_y_luego_archivo_grande(self):
+        # El error registrado no debe dejar el buffer de lectura bloqueado
+        hotels_path = os.path.join(self.tmp.name, "hotels.json")
+        with open(hotels_path, "w", encoding="utf-8") as f_out:
+            f_out.write("{not json}")
+        with self.assertLogs("reservation_system", "ERROR") as logs:
+            self.assertIsNone(self.system.obtener_hotel(1))
+        self.assertIn("JSON inválido", logs.output[0])
+
+        hotel = {
+            "id": 1,
+            "nombre": "x" * (70 * 1024),
+            "ubicacion": "Puebla",
+            "habitaciones_total": 5,
+            "habitaciones_disponibles": 5,
+        }
+        with open(hotels_path, "w", encoding="utf-8") as f_out:
+            json.dump([hotel], f_out)
+        self.assertEqual(self.system.obtener_hotel(1).nombre, hotel["nombre"])
 
     def test_registro_hotel_incompleto_no_revienta(self):
         # Metemos un hotel corrupto (faltan llaves)
@@ -134,8 +579,10 @@ class TestReservationSystem(unittest.TestCase):
             json.dump([{"id": 1, "nombre": "Hotel X"}], f_out)
 
         # Debe detectar error y regresar None
-        hotel = self.system.obtener_hotel(1)
+        with self.assertLogs("reservation_system", "ERROR") as logs:
+            hotel = self.system.obtener_hotel(1)
         self.assertIsNone(hotel)
+        self.assertIn("falta ubicacion", logs.output[0])
 
     def test_registro_cliente_tipo_incorrecto_no_revienta(self):
         customers_path = os.path.join(self.tmp.name, "customers.json")